@@ -1,8 +1,13 @@
 from __future__ import annotations
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
 
-from src.data_loader import fetch_ohlcv
+import pandas as pd
+
+from src.data_loader import fetch_ohlcv, fetch_ohlcv_cached
 from src.indicators import add_moving_averages, add_realized_vol
 from src.strategies import (
     sma_crossover_signals_from_df,
@@ -16,7 +21,6 @@ from src.backtester import (
     buy_and_hold_equity,
 )
 from src.metrics import summarize
-from src.plot import plot_equity
 
 
 def parse_args():
@@ -39,6 +43,10 @@ def parse_args():
     p.add_argument("--dte", type=int, default=30)
     p.add_argument("--rv_window", type=int, default=20)
 
+    p.add_argument("--no_cache", action="store_true", help="Always re-download (skip ~/.cache/algosim)")
+    p.add_argument("--no_plot", action="store_true", help="Skip plotting (matplotlib is never imported)")
+    p.add_argument("--save_plots", type=str, default="", help="Write PNGs to this dir instead of showing windows")
+
     return p.parse_args()
 
 
@@ -46,15 +54,19 @@ def clean_tickers(raw: str) -> list[str]:
     return [t.strip().upper() for t in raw.split(",") if t.strip()]
 
 
+def _fmt(k: str, v) -> str:
+    if isinstance(v, float) and (("CAGR" in k) or ("Drawdown" in k) or ("MaxDD" in k)):
+        return f"{k:>18}: {v: .2%}"
+    elif isinstance(v, float):
+        return f"{k:>18}: {v:,.2f}"
+    return f"{k:>18}: {v}"
+
+
 def print_summary(title: str, stats: dict) -> None:
-    print(f"\n=== {title} ===")
-    for k, v in stats.items():
-        if isinstance(v, float) and (("CAGR" in k) or ("Drawdown" in k) or ("MaxDD" in k)):
-            print(f"{k:>18}: {v: .2%}")
-        elif isinstance(v, float):
-            print(f"{k:>18}: {v:,.2f}")
-        else:
-            print(f"{k:>18}: {v}")
+    # one write per summary instead of one print per line
+    lines = [f"\n=== {title} ==="]
+    lines.extend(_fmt(k, v) for k, v in stats.items())
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def prompt_instrument_mode() -> str:
@@ -119,6 +131,45 @@ def prompt_call_settings(cfg: BacktestConfig) -> BacktestConfig:
     return cfg
 
 
+class _TickerResult(NamedTuple):
+    """One ticker's run; on fetch failure only tkr and error are set."""
+    tkr: str
+    stats: dict | None
+    bench: pd.Series | None
+    bt: pd.DataFrame | None
+    error: str | None = None
+
+
+def _run_one(tkr: str, args, cfg: BacktestConfig, pos_choice: str) -> _TickerResult:
+    """Everything for one ticker except printing/plotting."""
+    fetch = fetch_ohlcv if args.no_cache else fetch_ohlcv_cached
+    try:
+        df = fetch(tkr, args.start, args.end)
+    except Exception as e:
+        return _TickerResult(tkr, None, None, None, error=str(e))
+
+    df = add_moving_averages(df, windows=(args.fast, args.slow))
+    df = add_realized_vol(df, window=args.rv_window)
+
+    # choose signals
+    if args.mode == "stock" and pos_choice in ("short", "both"):
+        desired = sma_crossover_long_short_signals_from_df(df, fast=args.fast, slow=args.slow)
+    else:
+        desired = sma_crossover_signals_from_df(df, fast=args.fast, slow=args.slow)
+
+    bench = buy_and_hold_equity(df, initial_cash=args.initial_cash)
+
+    if args.mode == "stock":
+        bt = run_stock_backtest(df, desired, cfg)
+    elif args.mode == "long_call":
+        bt = run_long_call_backtest(df, desired, cfg)
+    else:
+        bt = run_stock_protective_put_backtest(df, desired, cfg)
+
+    stats = summarize(bt, benchmark_equity=bench)
+    return _TickerResult(tkr, stats, bench, bt)
+
+
 def main():
     args = parse_args()
 
@@ -181,34 +232,32 @@ def main():
     print("fee/slip bps:", args.fee_bps, args.slip_bps)
     print("RV window:", args.rv_window)
 
-    for tkr in tickers:
-        try:
-            df = fetch_ohlcv(tkr, args.start, args.end)
-        except Exception as e:
-            print(f"\n[SKIP] {tkr}: {e}")
-            continue
-
-        df = add_moving_averages(df, windows=(args.fast, args.slow))
-        df = add_realized_vol(df, window=args.rv_window)
-
-        # choose signals
-        if args.mode == "stock" and pos_choice in ("short", "both"):
-            desired = sma_crossover_long_short_signals_from_df(df, fast=args.fast, slow=args.slow)
-        else:
-            desired = sma_crossover_signals_from_df(df, fast=args.fast, slow=args.slow)
-
-        bench = buy_and_hold_equity(df, initial_cash=args.initial_cash)
+    # matplotlib is slow to import; only pay for it when plotting
+    if not args.no_plot:
+        if args.save_plots:
+            import matplotlib
+            matplotlib.use("Agg")
+            os.makedirs(args.save_plots, exist_ok=True)
+        from src.plot import plot_equity
+
+    # fetch + indicators + backtest per ticker in worker processes; plots stay on the main thread
+    if len(tickers) > 1:
+        workers = min(len(tickers), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_run_one, tkr, args, cfg, pos_choice) for tkr in tickers]
+            results = [f.result() for f in futures]
+    else:
+        results = [_run_one(tkr, args, cfg, pos_choice) for tkr in tickers]
 
-        if args.mode == "stock":
-            bt = run_stock_backtest(df, desired, cfg)
-        elif args.mode == "long_call":
-            bt = run_long_call_backtest(df, desired, cfg)
-        else:
-            bt = run_stock_protective_put_backtest(df, desired, cfg)
+    for tkr, stats, bench, bt, error in results:
+        if error is not None:
+            print(f"\n[SKIP] {tkr}: {error}")
+            continue
 
-        stats = summarize(bt, benchmark_equity=bench)
         print_summary(f"{tkr} | {args.mode} | SMA({args.fast},{args.slow}) | {args.execution}", stats)
-        plot_equity(bt, benchmark_equity=bench, title=f"{tkr} | {args.mode}")
+        if not args.no_plot:
+            savepath = os.path.join(args.save_plots, f"{tkr}_{args.mode}.png") if args.save_plots else None
+            plot_equity(bt, benchmark_equity=bench, title=f"{tkr} | {args.mode}", savepath=savepath)
 
 if __name__ == "__main__":
     main()
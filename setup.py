@@ -0,0 +1,18 @@
+# Optional: AOT-compile the backtest kernel with Cython.
+#   python setup.py build_ext --inplace
+# Without the build (or without Cython installed), src.backtester falls back to
+# the numba / pure-Python kernel.
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:  # optional; install as plain Python
+    ext_modules = []
+else:
+    ext_modules = cythonize("src/_backtest_kernels_cy.pyx")
+
+setup(
+    name="algoTradingSim",
+    packages=["src"],
+    ext_modules=ext_modules,
+)
@@ -0,0 +1,374 @@
+from __future__ import annotations
+import numpy as np
+
+from src._numba import njit
+from src.options import _bs_price_tbl
+
+
+@njit(cache=True)
+def _run_stock_kernel(px_exec, px_close, target, events, initial_cash, k, max_lev):
+    """
+    Stock state machine over raw arrays.
+
+    target[i] is the (already lagged + permission-filtered) position for bar i,
+    events are the bars where the target changes. A bar that ends with the
+    position still off target (unusable exec price, or a fill that couldn't
+    reach it, e.g. buying with cash <= 0 after covering a short) makes the next
+    bar an event too, exactly as a bar-by-bar loop would retry. Between events
+    cash and shares are constant, so those stretches are filled with slices.
+    k is the combined fee + slippage rate ((fee_bps + slippage_bps) / 10_000).
+
+    Returns (cash, shares, equity, trade_shares, trade_cost) arrays.
+    """
+    n = len(px_close)
+    one_plus_k = 1.0 + k
+    cash = initial_cash
+    shares = 0.0
+
+    cash_hist = np.empty(n)
+    shares_hist = np.empty(n)
+    equity_hist = np.empty(n)
+    trade_shares_hist = np.zeros(n)
+    trade_cost_hist = np.zeros(n)
+
+    n_events = len(events)
+    seg_start = 0
+    j = 0
+    i = -1
+    carry = False
+    while True:
+        # next bar to process: the one after a bar left off target, else the next event
+        if carry:
+            i += 1
+        elif j < n_events:
+            i = events[j]
+        else:
+            break
+        if i >= n:
+            break
+        while j < n_events and events[j] <= i:
+            j += 1
+
+        # nothing traded since the last event
+        cash_hist[seg_start:i] = cash
+        shares_hist[seg_start:i] = shares
+        equity_hist[seg_start:i] = cash + shares * px_close[seg_start:i]
+        seg_start = i
+
+        tgt = target[i]
+        px = px_exec[i]
+
+        # current position from shares sign
+        current = 0
+        if shares > 0:
+            current = 1
+        elif shares < 0:
+            current = -1
+
+        trade_shares = 0.0
+        tcost = 0.0
+
+        # if target differs from current, we close current then open target
+        if tgt != current and px > 0:
+            # 1) close current
+            if current == 1:
+                # sell all long shares
+                notional = abs(shares) * px
+                tcost = notional * k
+                cash += notional - tcost
+                trade_shares -= shares
+                shares = 0.0
+
+            elif current == -1:
+                # cover short: buy back shares
+                notional = abs(shares) * px
+                tcost = notional * k
+                cash -= notional + tcost
+                trade_shares -= shares  # shares is negative; subtracting adds positive buy amount
+                shares = 0.0
+
+            # 2) open new target
+            if tgt == 1:
+                invest_cash = cash * max_lev
+                buy_shares = invest_cash / px
+                notional = buy_shares * px
+                open_cost = notional * k
+
+                total = notional + open_cost
+                if total > cash:
+                    buy_shares = cash / (px * one_plus_k)
+                    notional = buy_shares * px
+                    open_cost = notional * k
+                    total = notional + open_cost
+
+                cash -= total
+                shares += buy_shares
+                trade_shares += buy_shares
+                tcost += open_cost
+
+            elif tgt == -1:
+                # short shares sized off equity proxy (cash) for simplicity
+                short_cash = cash * max_lev
+                short_shares = short_cash / px
+                notional = short_shares * px
+                open_cost = notional * k
+
+                # when shorting you RECEIVE notional, then pay costs
+                cash += notional - open_cost
+                shares -= short_shares  # negative shares
+                trade_shares -= short_shares
+                tcost += open_cost
+
+        trade_shares_hist[i] = trade_shares
+        trade_cost_hist[i] = tcost
+
+        # still off target -> the next bar retries
+        held = 0
+        if shares > 0:
+            held = 1
+        elif shares < 0:
+            held = -1
+        carry = held != tgt
+
+    cash_hist[seg_start:] = cash
+    shares_hist[seg_start:] = shares
+    equity_hist[seg_start:] = cash + shares * px_close[seg_start:]
+
+    return cash_hist, shares_hist, equity_hist, trade_shares_hist, trade_cost_hist
+
+
+@njit(cache=True)
+def _run_long_call_kernel(
+    px_exec, px_close_arr, sigma_arr, target_arr, strikes, initial_cash, k, mult, contracts, dte, r,
+    sqrt_T_tbl, disc_tbl,
+):
+    """
+    Long-call state machine over raw arrays (see run_long_call_backtest).
+    sigma_arr[i] is the per-bar vol (RV with fallback/floor already applied),
+    strikes[i] is the pre-rounded strike we'd buy on bar i.
+    target_arr[i] is the 0/1 long target for bar i (yesterday's signal, see backtester._lag_long_target).
+    sqrt_T_tbl / disc_tbl come from options.dte_tables(dte, r), indexed by days left.
+    k is the combined fee + slippage rate, as in _run_stock_kernel.
+
+    Mark-to-market never feeds back into trading, so it's left to the caller:
+    held_strike[i] / days_left[i] describe the call held at bar i's close
+    (days_left = -1 when flat).
+
+    Returns (cash, held_strike, days_left, trade_cost, trade_count) arrays.
+    """
+    n = len(px_close_arr)
+    cash = initial_cash
+    dte_k = max(dte, 0)  # a negative dte prices at intrinsic, same as 0
+    T_open = dte / 252.0
+
+    has_call = False
+    strike = 0.0
+    expiry_i = -1
+
+    cash_hist = np.empty(n)
+    held_strike_hist = np.zeros(n)
+    days_left_hist = np.full(n, -1, dtype=np.int64)
+    trade_cost_hist = np.zeros(n)
+    trade_count_hist = np.zeros(n, dtype=np.int64)
+    cash_hist[0] = cash
+
+    for i in range(1, n):
+        px = px_exec[i]
+        px_close = px_close_arr[i]
+
+        sigma = sigma_arr[i]
+
+        tcost = 0.0
+        trades = 0
+
+        # settle at expiry at close
+        if has_call and i >= expiry_i:
+            intrinsic = max(px_close - strike, 0.0)
+            cash += intrinsic * mult * contracts
+            has_call = False
+            strike = 0.0
+            expiry_i = -1
+
+        # already lagged and 0/1 (long calls only)
+        target = target_arr[i]
+
+        # enter
+        if target == 1 and not has_call:
+            K = strikes[i]
+
+            premium = _bs_price_tbl(px, K, T_open, sqrt_T_tbl[dte_k], disc_tbl[dte_k], sigma, r, True)
+
+            notional = premium * mult * contracts
+            tcost = notional * k
+            total = notional + tcost
+
+            if total <= cash:
+                cash -= total
+                has_call = True
+                strike = K
+                expiry_i = min(i + dte, n - 1)
+                trades += 1
+
+        # exit
+        elif target == 0 and has_call:
+            remaining_days = max(expiry_i - i, 0)
+            T = remaining_days / 252.0
+            mkt = _bs_price_tbl(px, strike, T, sqrt_T_tbl[remaining_days], disc_tbl[remaining_days], sigma, r, True)
+
+            proceeds = mkt * mult * contracts
+            tcost = proceeds * k
+
+            cash += proceeds - tcost
+            has_call = False
+            strike = 0.0
+            expiry_i = -1
+            trades += 1
+
+        if has_call:
+            held_strike_hist[i] = strike
+            days_left_hist[i] = max(expiry_i - i, 0)
+
+        cash_hist[i] = cash
+        trade_cost_hist[i] = tcost
+        trade_count_hist[i] = trades
+
+    return cash_hist, held_strike_hist, days_left_hist, trade_cost_hist, trade_count_hist
+
+
+@njit(cache=True)
+def _run_protective_put_kernel(
+    px_exec, px_close_arr, sigma_arr, target_arr, strikes, initial_cash, k, max_lev, mult, dte, r,
+    sqrt_T_tbl, disc_tbl,
+):
+    """
+    Long stock + ATM put state machine over raw arrays (see run_stock_protective_put_backtest).
+    sigma_arr[i] is the per-bar vol (RV with fallback/floor already applied),
+    strikes[i] is the pre-rounded ATM strike on bar i.
+    target_arr[i] is the 0/1 long target for bar i (yesterday's signal, see backtester._lag_long_target).
+    sqrt_T_tbl / disc_tbl come from options.dte_tables(dte, r), indexed by days left.
+    k is the combined fee + slippage rate, as in _run_stock_kernel.
+
+    As in the call kernel, the put is marked to market by the caller from
+    held_strike / days_left (-1 when no put); stock_equity is cash + shares * close.
+
+    Returns (cash, shares, held_strike, days_left, stock_equity, trade_cost, trade_count) arrays.
+    """
+    n = len(px_close_arr)
+    cash = initial_cash
+    dte_k = max(dte, 0)  # a negative dte prices at intrinsic, same as 0
+    T_open = dte / 252.0
+    one_plus_k = 1.0 + k
+    shares = 0.0
+
+    has_put = False
+    put_strike = 0.0
+    put_expiry_i = -1
+
+    cash_hist = np.empty(n)
+    shares_hist = np.zeros(n)
+    held_strike_hist = np.zeros(n)
+    days_left_hist = np.full(n, -1, dtype=np.int64)
+    stock_equity_hist = np.empty(n)
+    trade_cost_hist = np.zeros(n)
+    trade_count_hist = np.zeros(n, dtype=np.int64)
+    cash_hist[0] = cash
+    stock_equity_hist[0] = cash
+
+    for i in range(1, n):
+        px = px_exec[i]
+        px_close = px_close_arr[i]
+
+        sigma = sigma_arr[i]
+
+        tcost = 0.0
+        trades = 0
+
+        # settle put at expiry
+        if has_put and i >= put_expiry_i:
+            intrinsic = max(put_strike - px_close, 0.0)
+            cash += intrinsic * mult
+            has_put = False
+            put_strike = 0.0
+            put_expiry_i = -1
+
+        target = target_arr[i]
+
+        current = 1 if shares > 0 else 0
+
+        if target == 1 and current == 0 and px > 0:
+            invest_cash = cash * max_lev
+            buy_shares = invest_cash / px
+            notional = buy_shares * px
+            stock_cost = notional * k
+            total_outlay = notional + stock_cost
+
+            if total_outlay > cash:
+                buy_shares = cash / (px * one_plus_k)
+                notional = buy_shares * px
+                stock_cost = notional * k
+                total_outlay = notional + stock_cost
+
+            cash -= total_outlay
+            shares += buy_shares
+            tcost += stock_cost
+            trades += 1
+
+            # buy ATM put if cash left
+            K = strikes[i]
+            premium = _bs_price_tbl(px, K, T_open, sqrt_T_tbl[dte_k], disc_tbl[dte_k], sigma, r, False)
+
+            put_notional = premium * mult
+            put_cost = put_notional * k
+
+            if (put_notional + put_cost) <= cash:
+                cash -= (put_notional + put_cost)
+                has_put = True
+                put_strike = K
+                put_expiry_i = min(i + dte, n - 1)
+                tcost += put_cost
+                trades += 1
+
+        elif target == 0 and current == 1 and px > 0:
+            sell_notional = shares * px
+            stock_cost = sell_notional * k
+            cash += sell_notional - stock_cost
+            shares = 0.0
+            tcost += stock_cost
+            trades += 1
+
+            if has_put:
+                remaining_days = max(put_expiry_i - i, 0)
+                T = remaining_days / 252.0
+                mkt = _bs_price_tbl(
+                    px, put_strike, T, sqrt_T_tbl[remaining_days], disc_tbl[remaining_days], sigma, r, False
+                )
+
+                proceeds = mkt * mult
+                put_cost = proceeds * k
+
+                cash += proceeds - put_cost
+                has_put = False
+                put_strike = 0.0
+                put_expiry_i = -1
+                tcost += put_cost
+                trades += 1
+
+        if has_put:
+            held_strike_hist[i] = put_strike
+            days_left_hist[i] = max(put_expiry_i - i, 0)
+
+        cash_hist[i] = cash
+        shares_hist[i] = shares
+        stock_equity_hist[i] = cash + shares * px_close
+        trade_cost_hist[i] = tcost
+        trade_count_hist[i] = trades
+
+    return (
+        cash_hist,
+        shares_hist,
+        held_strike_hist,
+        days_left_hist,
+        stock_equity_hist,
+        trade_cost_hist,
+        trade_count_hist,
+    )
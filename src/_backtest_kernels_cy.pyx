@@ -0,0 +1,146 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+AOT-compiled twin of src/_backtest_kernels._run_stock_kernel (no JIT warmup).
+Build in place with: python setup.py build_ext --inplace
+"""
+import numpy as np
+from libc.math cimport fabs
+from libc.stdint cimport int64_t
+
+
+def _run_stock_kernel(
+    const double[::1] px_exec,
+    const double[::1] px_close,
+    const signed char[::1] target,
+    const int64_t[::1] events,
+    double initial_cash,
+    double k,
+    double max_lev,
+):
+    cdef Py_ssize_t n = px_close.shape[0]
+    cdef Py_ssize_t n_events = events.shape[0]
+    cdef Py_ssize_t i = -1
+    cdef Py_ssize_t j = 0
+    cdef Py_ssize_t t
+    cdef Py_ssize_t seg_start = 0
+    cdef bint carry = False
+    cdef int tgt, current, held
+    cdef double one_plus_k = 1.0 + k
+    cdef double cash = initial_cash
+    cdef double shares = 0.0
+    cdef double px, trade_shares, tcost, notional, open_cost, total
+    cdef double invest_cash, buy_shares, short_cash, short_shares
+
+    cash_arr = np.empty(n)
+    shares_arr = np.empty(n)
+    equity_arr = np.empty(n)
+    trade_shares_arr = np.zeros(n)
+    trade_cost_arr = np.zeros(n)
+
+    cdef double[::1] cash_hist = cash_arr
+    cdef double[::1] shares_hist = shares_arr
+    cdef double[::1] equity_hist = equity_arr
+    cdef double[::1] trade_shares_hist = trade_shares_arr
+    cdef double[::1] trade_cost_hist = trade_cost_arr
+
+    while True:
+        # next bar to process: the one after a bar left off target, else the next event
+        if carry:
+            i += 1
+        elif j < n_events:
+            i = events[j]
+        else:
+            break
+        if i >= n:
+            break
+        while j < n_events and events[j] <= i:
+            j += 1
+
+        # nothing traded since the last event
+        for t in range(seg_start, i):
+            cash_hist[t] = cash
+            shares_hist[t] = shares
+            equity_hist[t] = cash + shares * px_close[t]
+        seg_start = i
+
+        tgt = target[i]
+        px = px_exec[i]
+
+        # current position from shares sign
+        current = 0
+        if shares > 0:
+            current = 1
+        elif shares < 0:
+            current = -1
+
+        trade_shares = 0.0
+        tcost = 0.0
+
+        # if target differs from current, we close current then open target
+        if tgt != current and px > 0:
+            # 1) close current
+            if current == 1:
+                # sell all long shares
+                notional = fabs(shares) * px
+                tcost = notional * k
+                cash += notional - tcost
+                trade_shares -= shares
+                shares = 0.0
+
+            elif current == -1:
+                # cover short: buy back shares
+                notional = fabs(shares) * px
+                tcost = notional * k
+                cash -= notional + tcost
+                trade_shares -= shares  # shares is negative; subtracting adds positive buy amount
+                shares = 0.0
+
+            # 2) open new target
+            if tgt == 1:
+                invest_cash = cash * max_lev
+                buy_shares = invest_cash / px
+                notional = buy_shares * px
+                open_cost = notional * k
+
+                total = notional + open_cost
+                if total > cash:
+                    buy_shares = cash / (px * one_plus_k)
+                    notional = buy_shares * px
+                    open_cost = notional * k
+                    total = notional + open_cost
+
+                cash -= total
+                shares += buy_shares
+                trade_shares += buy_shares
+                tcost += open_cost
+
+            elif tgt == -1:
+                # short shares sized off equity proxy (cash) for simplicity
+                short_cash = cash * max_lev
+                short_shares = short_cash / px
+                notional = short_shares * px
+                open_cost = notional * k
+
+                # when shorting you RECEIVE notional, then pay costs
+                cash += notional - open_cost
+                shares -= short_shares  # negative shares
+                trade_shares -= short_shares
+                tcost += open_cost
+
+        trade_shares_hist[i] = trade_shares
+        trade_cost_hist[i] = tcost
+
+        # still off target -> the next bar retries
+        held = 0
+        if shares > 0:
+            held = 1
+        elif shares < 0:
+            held = -1
+        carry = held != tgt
+
+    for t in range(seg_start, n):
+        cash_hist[t] = cash
+        shares_hist[t] = shares
+        equity_hist[t] = cash + shares * px_close[t]
+
+    return cash_arr, shares_arr, equity_arr, trade_shares_arr, trade_cost_arr
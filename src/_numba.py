@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels run as plain Python without it
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
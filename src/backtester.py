@@ -1,9 +1,17 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple
 import pandas as pd
 import numpy as np
 
-from src.options import bs_price, round_strike
+from src.options import bs_price_vec, dte_tables
+
+try:  # AOT Cython build (python setup.py build_ext --inplace), no JIT warmup
+    from src._backtest_kernels_cy import _run_stock_kernel
+except ImportError:
+    from src._backtest_kernels import _run_stock_kernel
+from src._backtest_kernels import _run_long_call_kernel, _run_protective_put_kernel
 
 
 @dataclass
@@ -28,18 +36,149 @@ class BacktestConfig:
     call_otm_pct: float = 0.0   # 0.0 = ATM, 0.05 = 5% OTM
     call_contracts: int = 1     # number of contracts
 
+    # output storage: float32 halves history memory (loop math stays float64)
+    float32_history: bool = False
+
+
+@dataclass(frozen=True)
+class _KernelParams:
+    """Per-run scalars the kernels need, derived once from a BacktestConfig."""
+    k: float            # fee + slippage as a fraction of notional
+    max_lev: float
+    long_only: bool
+    allow_short: bool
+
+
+@lru_cache(maxsize=None)
+def _kernel_params_cached(
+    fee_bps: float, slippage_bps: float, max_leverage: float, long_only: bool, allow_short: bool
+) -> _KernelParams:
+    return _KernelParams(
+        k=(fee_bps + slippage_bps) / 10_000.0,
+        max_lev=float(max_leverage),
+        long_only=bool(long_only),
+        allow_short=bool(allow_short),
+    )
+
+
+def _kernel_params(cfg: BacktestConfig) -> _KernelParams:
+    # BacktestConfig is mutable (unhashable), so key the cache on the relevant fields
+    return _kernel_params_cached(cfg.fee_bps, cfg.slippage_bps, cfg.max_leverage, cfg.long_only, cfg.allow_short)
 
-def _trade_cost(notional: float, fee_bps: float, slippage_bps: float) -> float:
-    return notional * (fee_bps + slippage_bps) / 10_000.0
+
+def _store(arr: np.ndarray, cfg: BacktestConfig) -> np.ndarray:
+    """History column in the configured storage dtype."""
+    return arr.astype(np.float32) if cfg.float32_history else arr
+
+
+class _OHLCVArrays(NamedTuple):
+    """One C-contiguous float64 array per column the kernels read (rv is None without an RV column)."""
+    open_: np.ndarray
+    close: np.ndarray
+    rv: np.ndarray | None
+
+
+def _col(df: pd.DataFrame, name: str) -> np.ndarray:
+    # row-sliced frames (e.g. df.iloc[::2]) hand back strided views; the kernels want unit stride
+    return np.ascontiguousarray(df[name].to_numpy(dtype=np.float64))
+
+
+def _ohlcv_to_soa(df: pd.DataFrame) -> _OHLCVArrays:
+    # convert each column once up front; the kernels then stream plain arrays
+    return _OHLCVArrays(
+        open_=_col(df, "Open"),
+        close=_col(df, "Close"),
+        rv=_col(df, "RV") if "RV" in df.columns else None,
+    )
+
+
+def _positions_int8(arr: np.ndarray) -> np.ndarray:
+    """
+    Numeric positions as a fresh int8 array (NaN -> 0, floats truncate like astype(int)).
+    Values are clipped to -2..2 before narrowing so nothing wraps into -1..1:
+    anything outside -1..1 stays a flat signal, e.g. 257 -> 2, not 1.
+    """
+    if arr.dtype.kind == "b":
+        return arr.astype(np.int8)
+    if arr.dtype.kind == "u":
+        return np.minimum(arr, 2).astype(np.int8)
+    if arr.dtype.kind == "f":
+        arr = np.nan_to_num(arr, nan=0.0)
+    return np.clip(arr, -2, 2).astype(np.int8)
+
+
+def _align_desired(desired_pos: pd.Series, index: pd.Index) -> np.ndarray:
+    """
+    desired_pos on `index` as a fresh int8 array (missing -> 0, see _positions_int8).
+    Skips the reindex when the indices already match (the usual case).
+    """
+    if not (desired_pos.index is index or desired_pos.index.equals(index)):
+        desired_pos = desired_pos.reindex(index)
+    arr = desired_pos.to_numpy()
+    if arr.dtype.kind not in "biuf":
+        arr = desired_pos.fillna(0).astype(int).to_numpy()
+    return _positions_int8(arr)
+
+
+def _lag_long_target(d: np.ndarray) -> np.ndarray:
+    """Options target per bar: 1 if yesterday's desired position was long, else 0 (flat on bar 0)."""
+    target = np.zeros(len(d), dtype=np.int8)
+    target[1:] = d[:-1] == 1
+    return target
+
+
+def _sigma_array(rv: np.ndarray) -> np.ndarray:
+    """RV as the per-bar Black-Scholes sigma: NaN -> 0.25 fallback, floored at 5%."""
+    sigma = rv.astype(np.float64, copy=True)
+    sigma[np.isnan(sigma)] = 0.25
+    np.maximum(sigma, 0.05, out=sigma)
+    return sigma
+
+
+def _mark_to_market(
+    px_close: np.ndarray,
+    held_strike: np.ndarray,
+    days_left: np.ndarray,
+    sigma: np.ndarray,
+    r: float,
+    is_call: bool,
+    sqrt_T_tbl: np.ndarray,
+    disc_tbl: np.ndarray,
+) -> np.ndarray:
+    """Per-share BS value at each close of the option held on that bar (0 where none is held)."""
+    val = np.zeros(len(px_close))
+    held = days_left >= 0
+    if held.any():
+        d = days_left[held]
+        val[held] = bs_price_vec(
+            px_close[held],
+            held_strike[held],
+            d / 252.0,
+            sigma[held],
+            r=r,
+            is_call=is_call,
+            sqrt_T=sqrt_T_tbl[d],
+            disc=disc_tbl[d],
+        )
+    return val
+
+
+def _equity_returns(equity: np.ndarray) -> np.ndarray:
+    """Same as Series.pct_change().fillna(0.0), computed straight on the array."""
+    ret = np.zeros_like(equity)
+    if len(equity) > 1:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(equity[1:], equity[:-1], out=ret[1:])
+        ret[1:] -= 1.0
+        np.copyto(ret, 0.0, where=np.isnan(ret))
+    return ret
 
 
 def buy_and_hold_equity(ohlcv: pd.DataFrame, initial_cash: float = 10_000.0) -> pd.Series:
-    df = ohlcv.copy()
-    first = float(df["Close"].iloc[0])
+    close = ohlcv["Close"].to_numpy(dtype=np.float64)
+    first = float(close[0])
     shares = initial_cash / first if first > 0 else 0.0
-    equity = shares * df["Close"]
-    equity.name = "BuyHoldEquity"
-    return equity
+    return pd.Series(close * shares, index=ohlcv.index, name="BuyHoldEquity")
 
 
 def run_stock_backtest(ohlcv: pd.DataFrame, desired_pos: pd.Series, cfg: BacktestConfig) -> pd.DataFrame:
@@ -53,118 +192,62 @@ def run_stock_backtest(ohlcv: pd.DataFrame, desired_pos: pd.Series, cfg: Backtes
       - Enter long: spend cash to buy shares
       - Enter short: sell borrowed shares -> cash increases
       - Equity = cash + shares * close (shares negative for short)
+
+    Cash and shares only move on bars where the (lagged) target changes; the
+    event walk itself lives in _run_stock_kernel (Cython build if present,
+    else numba-compiled if available).
     """
-    df = ohlcv.copy()
-    desired = desired_pos.reindex(df.index).fillna(0).astype(int)
+    df = ohlcv  # read-only below, no need to copy the frame
 
     if cfg.execution not in ("next_open", "next_close"):
         raise ValueError("cfg.execution must be 'next_open' or 'next_close'")
 
-    exec_price = df["Open"] if cfg.execution == "next_open" else df["Close"]
-
-    cash = float(cfg.initial_cash)
-    shares = 0.0
-
-    cash_hist = [cash]
-    shares_hist = [shares]
-    equity_hist = [cash + shares * float(df["Close"].iloc[0])]
-    trade_shares_hist = [0.0]
-    trade_cost_hist = [0.0]
-
-    for i in range(1, len(df)):
-        target = int(desired.iloc[i - 1])
-
-        # permission rules
-        if cfg.long_only:
-            target = 1 if target == 1 else 0
-        if (target < 0) and (not cfg.allow_short):
-            target = 0
-
-        px_exec = float(exec_price.iloc[i])
-        px_close = float(df["Close"].iloc[i])
-
-        # current position from shares sign
-        current = 0
-        if shares > 0:
-            current = 1
-        elif shares < 0:
-            current = -1
-
-        trade_shares = 0.0
-        tcost = 0.0
-
-        # if target differs from current, we close current then open target
-        if target != current and px_exec > 0:
-            # 1) close current
-            if current == 1:
-                # sell all long shares
-                notional = abs(shares) * px_exec
-                tcost = _trade_cost(notional, cfg.fee_bps, cfg.slippage_bps)
-                cash += notional - tcost
-                trade_shares -= shares
-                shares = 0.0
-
-            elif current == -1:
-                # cover short: buy back shares
-                notional = abs(shares) * px_exec
-                tcost = _trade_cost(notional, cfg.fee_bps, cfg.slippage_bps)
-                cash -= notional + tcost
-                trade_shares -= shares  # shares is negative; subtracting adds positive buy amount
-                shares = 0.0
-
-            # 2) open new target
-            if target == 1:
-                invest_cash = cash * cfg.max_leverage
-                buy_shares = invest_cash / px_exec
-                notional = buy_shares * px_exec
-                open_cost = _trade_cost(notional, cfg.fee_bps, cfg.slippage_bps)
-
-                total = notional + open_cost
-                if total > cash:
-                    k = (cfg.fee_bps + cfg.slippage_bps) / 10_000.0
-                    buy_shares = cash / (px_exec * (1.0 + k))
-                    notional = buy_shares * px_exec
-                    open_cost = _trade_cost(notional, cfg.fee_bps, cfg.slippage_bps)
-                    total = notional + open_cost
-
-                cash -= total
-                shares += buy_shares
-                trade_shares += buy_shares
-                tcost += open_cost
-
-            elif target == -1:
-                # short shares sized off equity proxy (cash) for simplicity
-                short_cash = cash * cfg.max_leverage
-                short_shares = short_cash / px_exec
-                notional = short_shares * px_exec
-                open_cost = _trade_cost(notional, cfg.fee_bps, cfg.slippage_bps)
-
-                # when shorting you RECEIVE notional, then pay costs
-                cash += notional - open_cost
-                shares -= short_shares  # negative shares
-                trade_shares -= short_shares
-                tcost += open_cost
-
-        equity = cash + shares * px_close
-
-        cash_hist.append(cash)
-        shares_hist.append(shares)
-        equity_hist.append(equity)
-        trade_shares_hist.append(trade_shares)
-        trade_cost_hist.append(tcost)
+    soa = _ohlcv_to_soa(df)
+    px_exec = soa.open_ if cfg.execution == "next_open" else soa.close
+    px_close = soa.close
+    d = _align_desired(desired_pos, df.index)
+
+    params = _kernel_params(cfg)
+
+    # permission rules as one lookup: permit[v + 2] is the position allowed for raw value v;
+    # _align_desired already clipped to -2..2, so anything outside -1..1 lands on a flat end slot
+    short = -1 if params.allow_short and not params.long_only else 0
+    permit = np.array([0, short, 0, 1, 0], dtype=np.int8)
+    d = permit[np.clip(d, -2, 2) + 2]
+
+    # bar i trades on yesterday's signal
+    n = len(df)
+    target = np.zeros(n, dtype=np.int8)
+    target[1:] = d[:-1]
+
+    # a trade can only start where the target changes; the kernel carries it
+    # over bar by bar while the position stays off target (bad price, blown account)
+    events = np.flatnonzero(np.diff(target) != 0) + 1
+
+    cash_hist, shares_hist, equity_hist, trade_shares_hist, trade_cost_hist = _run_stock_kernel(
+        px_exec,
+        px_close,
+        target,
+        events.astype(np.int64),
+        float(cfg.initial_cash),
+        params.k,
+        params.max_lev,
+    )
 
     out = pd.DataFrame(
         {
-            "Close": df["Close"].to_numpy().reshape(-1),
-            "Cash": cash_hist,
-            "Shares": shares_hist,
-            "Equity": equity_hist,
-            "TradeShares": trade_shares_hist,
-            "TradeCost": trade_cost_hist,
+            "Close": px_close.copy(),  # px_close is a view into the caller's frame
+            "Cash": _store(cash_hist, cfg),
+            "Shares": _store(shares_hist, cfg),
+            "Equity": _store(equity_hist, cfg),
+            # trades are a handful of bars out of thousands -> store them sparse
+            "TradeShares": pd.arrays.SparseArray(_store(trade_shares_hist, cfg), fill_value=0.0),
+            "TradeCost": pd.arrays.SparseArray(_store(trade_cost_hist, cfg), fill_value=0.0),
+            "EquityReturn": _equity_returns(equity_hist),
         },
         index=df.index,
+        copy=False,  # columns are fresh arrays owned by us; skip the consolidating copy
     )
-    out["EquityReturn"] = out["Equity"].pct_change().fillna(0.0)
     return out
 
 
@@ -175,9 +258,9 @@ def run_long_call_backtest(ohlcv: pd.DataFrame, desired_pos: pd.Series, cfg: Bac
       - Sell when OFF or settle at expiry
     User chooses: DTE, OTM %, contracts, strike step.
     Requires df['RV'].
+    The bar loop runs in _run_long_call_kernel (numba-compiled if available).
     """
-    df = ohlcv.copy()
-    desired = desired_pos.reindex(df.index).fillna(0).astype(int)
+    df = ohlcv  # read-only below, no need to copy the frame
 
     if "RV" not in df.columns:
         raise ValueError("Options backtest requires df['RV'] (run add_realized_vol).")
@@ -185,105 +268,61 @@ def run_long_call_backtest(ohlcv: pd.DataFrame, desired_pos: pd.Series, cfg: Bac
     if cfg.execution not in ("next_open", "next_close"):
         raise ValueError("cfg.execution must be 'next_open' or 'next_close'")
 
-    exec_price = df["Open"] if cfg.execution == "next_open" else df["Close"]
+    soa = _ohlcv_to_soa(df)
+    px_exec = soa.open_ if cfg.execution == "next_open" else soa.close
+    px_close = soa.close
+    target_arr = _lag_long_target(_align_desired(desired_pos, df.index))
+    sigma_arr = _sigma_array(soa.rv)
 
-    cash = float(cfg.initial_cash)
+    # cfg scalars read once, as plain locals
+    params = _kernel_params(cfg)
+    mult = int(cfg.option_contract_multiplier)
+    dte = int(cfg.option_dte_days)
+    r = float(cfg.risk_free_rate)
+
+    # every T an option can see is k/252 for k = 0..dte: tabulate sqrt(T), exp(-rT) once
+    sqrt_T_tbl, disc_tbl = dte_tables(dte, r)
 
     contracts = max(int(cfg.call_contracts), 1)
-    has_call = False
-    strike = 0.0
-    expiry_i = -1
-
-    cash_hist = [cash]
-    opt_val_hist = [0.0]
-    equity_hist = [cash]
-    trade_cost_hist = [0.0]
-    trade_count_hist = [0]
-
-    for i in range(1, len(df)):
-        px_exec = float(exec_price.iloc[i])
-        px_close = float(df["Close"].iloc[i])
-
-        sigma = float(df["RV"].iloc[i]) if not np.isnan(df["RV"].iloc[i]) else 0.25
-        sigma = max(sigma, 0.05)
-
-        tcost = 0.0
-        trades = 0
-
-        # settle at expiry at close
-        if has_call and i >= expiry_i:
-            intrinsic = max(px_close - strike, 0.0)
-            cash += intrinsic * cfg.option_contract_multiplier * contracts
-            has_call = False
-            strike = 0.0
-            expiry_i = -1
-
-        # desired is 0/1 here (long calls only)
-        target = int(desired.iloc[i - 1])
-        target = 1 if target == 1 else 0
-
-        # enter
-        if target == 1 and not has_call:
-            S_for_strike = px_exec * (1.0 + float(cfg.call_otm_pct))
-            K = round_strike(S_for_strike, step=cfg.option_strike_step)
-
-            T = cfg.option_dte_days / 252.0
-            premium = bs_price(px_exec, K, T, sigma=sigma, r=cfg.risk_free_rate, option_type="call")
-
-            notional = premium * cfg.option_contract_multiplier * contracts
-            tcost = _trade_cost(notional, cfg.fee_bps, cfg.slippage_bps)
-            total = notional + tcost
-
-            if total <= cash:
-                cash -= total
-                has_call = True
-                strike = K
-                expiry_i = min(i + cfg.option_dte_days, len(df) - 1)
-                trades += 1
-
-        # exit
-        elif target == 0 and has_call:
-            remaining_days = max(expiry_i - i, 0)
-            T = remaining_days / 252.0
-            mkt = bs_price(px_exec, strike, T, sigma=sigma, r=cfg.risk_free_rate, option_type="call")
-
-            proceeds = mkt * cfg.option_contract_multiplier * contracts
-            tcost = _trade_cost(proceeds, cfg.fee_bps, cfg.slippage_bps)
-
-            cash += proceeds - tcost
-            has_call = False
-            strike = 0.0
-            expiry_i = -1
-            trades += 1
-
-        # mark-to-market at close
-        opt_val = 0.0
-        if has_call:
-            remaining_days = max(expiry_i - i, 0)
-            T = remaining_days / 252.0
-            mkt_close = bs_price(px_close, strike, T, sigma=sigma, r=cfg.risk_free_rate, option_type="call")
-            opt_val = mkt_close * cfg.option_contract_multiplier * contracts
-
-        equity = cash + opt_val
-
-        cash_hist.append(cash)
-        opt_val_hist.append(opt_val)
-        equity_hist.append(equity)
-        trade_cost_hist.append(tcost)
-        trade_count_hist.append(trades)
+    # round_strike for every bar at once (np.round is half-to-even like round())
+    step = cfg.option_strike_step
+    strikes = np.round(px_exec * (1.0 + float(cfg.call_otm_pct)) / step) * step
+
+    cash_hist, held_strike, days_left, trade_cost_hist, trade_count_hist = _run_long_call_kernel(
+        px_exec,
+        px_close,
+        sigma_arr,
+        target_arr,
+        strikes,
+        float(cfg.initial_cash),
+        params.k,
+        mult,
+        contracts,
+        dte,
+        r,
+        sqrt_T_tbl,
+        disc_tbl,
+    )
+
+    # mark-to-market at close, all held bars in one vectorized BS call
+    opt_val_hist = _mark_to_market(
+        px_close, held_strike, days_left, sigma_arr, r, True, sqrt_T_tbl, disc_tbl
+    ) * (mult * contracts)
+    equity_hist = cash_hist + opt_val_hist
 
     out = pd.DataFrame(
         {
-            "Close": df["Close"].to_numpy().reshape(-1),
-            "Cash": cash_hist,
-            "OptionValue": opt_val_hist,
-            "Equity": equity_hist,
+            "Close": px_close.copy(),  # px_close is a view into the caller's frame
+            "Cash": _store(cash_hist, cfg),
+            "OptionValue": _store(opt_val_hist, cfg),
+            "Equity": _store(equity_hist, cfg),
             "TradeCount": trade_count_hist,
-            "TradeCost": trade_cost_hist,
+            "TradeCost": _store(trade_cost_hist, cfg),
+            "EquityReturn": _equity_returns(equity_hist),
         },
         index=df.index,
+        copy=False,
     )
-    out["EquityReturn"] = out["Equity"].pct_change().fillna(0.0)
     return out
 
 
@@ -292,9 +331,9 @@ def run_stock_protective_put_backtest(ohlcv: pd.DataFrame, desired_pos: pd.Serie
     Long stock + buy 1 ATM put hedge (if cash left).
     Long-only by design.
     Requires df['RV'].
+    The bar loop runs in _run_protective_put_kernel (numba-compiled if available).
     """
-    df = ohlcv.copy()
-    desired = desired_pos.reindex(df.index).fillna(0).astype(int)
+    df = ohlcv  # read-only below, no need to copy the frame
 
     if "RV" not in df.columns:
         raise ValueError("Protective put requires df['RV'] (run add_realized_vol).")
@@ -302,130 +341,66 @@ def run_stock_protective_put_backtest(ohlcv: pd.DataFrame, desired_pos: pd.Serie
     if cfg.execution not in ("next_open", "next_close"):
         raise ValueError("cfg.execution must be 'next_open' or 'next_close'")
 
-    exec_price = df["Open"] if cfg.execution == "next_open" else df["Close"]
-
-    cash = float(cfg.initial_cash)
-    shares = 0.0
-
-    has_put = False
-    put_strike = 0.0
-    put_expiry_i = -1
-
-    cash_hist = [cash]
-    shares_hist = [shares]
-    put_val_hist = [0.0]
-    equity_hist = [cash]
-    trade_cost_hist = [0.0]
-    trade_count_hist = [0]
-
-    for i in range(1, len(df)):
-        px_exec = float(exec_price.iloc[i])
-        px_close = float(df["Close"].iloc[i])
-
-        sigma = float(df["RV"].iloc[i]) if not np.isnan(df["RV"].iloc[i]) else 0.25
-        sigma = max(sigma, 0.05)
-
-        tcost = 0.0
-        trades = 0
-
-        # settle put at expiry
-        if has_put and i >= put_expiry_i:
-            intrinsic = max(put_strike - px_close, 0.0)
-            cash += intrinsic * cfg.option_contract_multiplier
-            has_put = False
-            put_strike = 0.0
-            put_expiry_i = -1
-
-        target = int(desired.iloc[i - 1])
-        target = 1 if target == 1 else 0
-
-        current = 1 if shares > 0 else 0
-
-        if target == 1 and current == 0 and px_exec > 0:
-            invest_cash = cash * cfg.max_leverage
-            buy_shares = invest_cash / px_exec
-            notional = buy_shares * px_exec
-            stock_cost = _trade_cost(notional, cfg.fee_bps, cfg.slippage_bps)
-            total_outlay = notional + stock_cost
-
-            if total_outlay > cash:
-                k = (cfg.fee_bps + cfg.slippage_bps) / 10_000.0
-                buy_shares = cash / (px_exec * (1.0 + k))
-                notional = buy_shares * px_exec
-                stock_cost = _trade_cost(notional, cfg.fee_bps, cfg.slippage_bps)
-                total_outlay = notional + stock_cost
-
-            cash -= total_outlay
-            shares += buy_shares
-            tcost += stock_cost
-            trades += 1
-
-            # buy ATM put if cash left
-            K = round_strike(px_exec, step=cfg.option_strike_step)
-            T = cfg.option_dte_days / 252.0
-            premium = bs_price(px_exec, K, T, sigma=sigma, r=cfg.risk_free_rate, option_type="put")
-
-            put_notional = premium * cfg.option_contract_multiplier
-            put_cost = _trade_cost(put_notional, cfg.fee_bps, cfg.slippage_bps)
-
-            if (put_notional + put_cost) <= cash:
-                cash -= (put_notional + put_cost)
-                has_put = True
-                put_strike = K
-                put_expiry_i = min(i + cfg.option_dte_days, len(df) - 1)
-                tcost += put_cost
-                trades += 1
-
-        elif target == 0 and current == 1 and px_exec > 0:
-            sell_notional = shares * px_exec
-            stock_cost = _trade_cost(sell_notional, cfg.fee_bps, cfg.slippage_bps)
-            cash += sell_notional - stock_cost
-            shares = 0.0
-            tcost += stock_cost
-            trades += 1
-
-            if has_put:
-                remaining_days = max(put_expiry_i - i, 0)
-                T = remaining_days / 252.0
-                mkt = bs_price(px_exec, put_strike, T, sigma=sigma, r=cfg.risk_free_rate, option_type="put")
-
-                proceeds = mkt * cfg.option_contract_multiplier
-                put_cost = _trade_cost(proceeds, cfg.fee_bps, cfg.slippage_bps)
-
-                cash += proceeds - put_cost
-                has_put = False
-                put_strike = 0.0
-                put_expiry_i = -1
-                tcost += put_cost
-                trades += 1
-
-        put_val = 0.0
-        if has_put:
-            remaining_days = max(put_expiry_i - i, 0)
-            T = remaining_days / 252.0
-            mkt_close = bs_price(px_close, put_strike, T, sigma=sigma, r=cfg.risk_free_rate, option_type="put")
-            put_val = mkt_close * cfg.option_contract_multiplier
-
-        equity = cash + shares * px_close + put_val
-
-        cash_hist.append(cash)
-        shares_hist.append(shares)
-        put_val_hist.append(put_val)
-        equity_hist.append(equity)
-        trade_cost_hist.append(tcost)
-        trade_count_hist.append(trades)
+    soa = _ohlcv_to_soa(df)
+    px_exec = soa.open_ if cfg.execution == "next_open" else soa.close
+    px_close = soa.close
+    target_arr = _lag_long_target(_align_desired(desired_pos, df.index))
+    sigma_arr = _sigma_array(soa.rv)
+
+    # cfg scalars read once, as plain locals
+    params = _kernel_params(cfg)
+    mult = int(cfg.option_contract_multiplier)
+    dte = int(cfg.option_dte_days)
+    r = float(cfg.risk_free_rate)
+
+    # every T an option can see is k/252 for k = 0..dte: tabulate sqrt(T), exp(-rT) once
+    sqrt_T_tbl, disc_tbl = dte_tables(dte, r)
+
+    # ATM round_strike for every bar at once (np.round is half-to-even like round())
+    step = cfg.option_strike_step
+    strikes = np.round(px_exec / step) * step
+
+    (
+        cash_hist,
+        shares_hist,
+        held_strike,
+        days_left,
+        stock_equity,
+        trade_cost_hist,
+        trade_count_hist,
+    ) = _run_protective_put_kernel(
+        px_exec,
+        px_close,
+        sigma_arr,
+        target_arr,
+        strikes,
+        float(cfg.initial_cash),
+        params.k,
+        params.max_lev,
+        mult,
+        dte,
+        r,
+        sqrt_T_tbl,
+        disc_tbl,
+    )
+
+    put_val_hist = _mark_to_market(
+        px_close, held_strike, days_left, sigma_arr, r, False, sqrt_T_tbl, disc_tbl
+    ) * mult
+    equity_hist = stock_equity + put_val_hist
 
     out = pd.DataFrame(
         {
-            "Close": df["Close"].to_numpy().reshape(-1),
-            "Cash": cash_hist,
-            "Shares": shares_hist,
-            "PutValue": put_val_hist,
-            "Equity": equity_hist,
+            "Close": px_close.copy(),  # px_close is a view into the caller's frame
+            "Cash": _store(cash_hist, cfg),
+            "Shares": _store(shares_hist, cfg),
+            "PutValue": _store(put_val_hist, cfg),
+            "Equity": _store(equity_hist, cfg),
             "TradeCount": trade_count_hist,
-            "TradeCost": trade_cost_hist,
+            "TradeCost": _store(trade_cost_hist, cfg),
+            "EquityReturn": _equity_returns(equity_hist),
         },
         index=df.index,
+        copy=False,
     )
-    out["EquityReturn"] = out["Equity"].pct_change().fillna(0.0)
     return out
@@ -1,8 +1,19 @@
 from __future__ import annotations
+import time
+from datetime import datetime
+from pathlib import Path
+
 import pandas as pd
 import yfinance as yf
 
 
+CACHE_DIR = Path.home() / ".cache" / "algosim"
+# daily snapshots tracked in the repo, named {ticker}_{start}_{end}.csv
+LEGACY_CSV_DIR = Path(__file__).resolve().parent.parent / "data"
+
+_OHLCV_COLS = ["Open", "High", "Low", "Close", "Volume"]
+
+
 def fetch_ohlcv(ticker: str, start: str, end: str, interval: str = "1d") -> pd.DataFrame:
     df = yf.download(
         ticker,
@@ -21,8 +32,7 @@ def fetch_ohlcv(ticker: str, start: str, end: str, interval: str = "1d") -> pd.D
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = df.columns.get_level_values(0)
 
-    expected = ["Open", "High", "Low", "Close", "Volume"]
-    df = df[[c for c in expected if c in df.columns]].dropna()
+    df = df[[c for c in _OHLCV_COLS if c in df.columns]].dropna()
 
     if "Open" not in df.columns or "Close" not in df.columns:
         raise ValueError("Missing required columns: Open and Close are required.")
@@ -34,3 +44,71 @@ def fetch_ohlcv(ticker: str, start: str, end: str, interval: str = "1d") -> pd.D
         df["Close"] = df["Close"].iloc[:, 0]
 
     return df
+
+
+def _cache_is_fresh(path: Path, end: str) -> bool:
+    # a file written before `end` may be missing the latest bars; only trust it for a day
+    written = datetime.fromtimestamp(path.stat().st_mtime)
+    if written < pd.Timestamp(end).to_pydatetime():
+        return (time.time() - path.stat().st_mtime) < 24 * 3600
+    return True
+
+
+def _read_legacy_csv(path: Path, end: str) -> pd.DataFrame | None:
+    """
+    A legacy CSV snapshot as a fetch_ohlcv-shaped frame, or None if unusable.
+    The file's mtime is just the checkout time, so instead of _cache_is_fresh
+    the data itself must reach the last weekday before `end` (yfinance's end
+    is exclusive); a snapshot that stops short is ignored and refetched.
+    """
+    try:
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+    except (OSError, ValueError):
+        return None
+    df = df[[c for c in _OHLCV_COLS if c in df.columns]].dropna()
+    if df.empty or "Open" not in df.columns or "Close" not in df.columns:
+        return None
+    df.index = pd.to_datetime(df.index)
+    if df.index[-1] < pd.Timestamp(end).normalize() - pd.offsets.BDay(1):
+        return None
+    return df
+
+
+def fetch_ohlcv_cached(
+    ticker: str,
+    start: str,
+    end: str,
+    interval: str = "1d",
+    cache_dir: str | Path | None = None,
+) -> pd.DataFrame:
+    """
+    fetch_ohlcv with an on-disk parquet cache keyed by (ticker, start, end).
+    Caching is best-effort: without a parquet engine (pyarrow) it just fetches.
+    A legacy CSV with the same key in LEGACY_CSV_DIR is parsed once and used
+    to seed the parquet cache instead of downloading.
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+    key = f"{ticker}_{start}_{end}" if interval == "1d" else f"{ticker}_{start}_{end}_{interval}"
+    path = cache_dir / f"{key}.parquet"
+
+    if path.exists() and _cache_is_fresh(path, end):
+        try:
+            return pd.read_parquet(path)
+        except (ImportError, OSError, ValueError):
+            pass  # no engine / unreadable file -> refetch
+
+    df = None
+    csv_path = LEGACY_CSV_DIR / f"{key}.csv"
+    if csv_path.exists():
+        df = _read_legacy_csv(csv_path, end)
+
+    if df is None:
+        df = fetch_ohlcv(ticker, start, end, interval=interval)
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path)
+    except (ImportError, OSError):
+        pass
+
+    return df
@@ -1,11 +1,50 @@
 import pandas as pd
 import numpy as np
 
+try:
+    import bottleneck as bn
+except ImportError:  # optional; pandas rolling is the fallback
+    bn = None
+
 
 def add_moving_averages(df: pd.DataFrame, windows=(20, 50)) -> pd.DataFrame:
+    """
+    SMA{w} columns for each window.
+    Uses bottleneck.move_mean when installed; otherwise all windows come from
+    one prefix sum of Close: SMA_w[i] = (cs[i+1] - cs[i+1-w]) / w.
+    """
+    if "Close" not in df.columns:
+        raise ValueError("Moving averages require df['Close'].")
+
     df = df.copy()
+    close = df["Close"].to_numpy(dtype=np.float64)
+    n = len(close)
+
+    for w in windows:
+        if w < 1:
+            raise ValueError("SMA window must be >= 1")
+
+    if bn is not None:
+        for w in windows:
+            # min_count=w -> NaN warm-up / gaps exactly like rolling(w).mean()
+            df[f"SMA{w}"] = bn.move_mean(close, window=w, min_count=w) if w <= n else np.full(n, np.nan)
+        return df
+
+    # a NaN would poison the prefix sum from that point on; let pandas skip it
+    if np.isnan(close).any():
+        for w in windows:
+            df[f"SMA{w}"] = df["Close"].rolling(window=w).mean()
+        return df
+
+    cs = np.empty(n + 1)
+    cs[0] = 0.0
+    np.cumsum(close, out=cs[1:])
+
     for w in windows:
-        df[f"SMA{w}"] = df["Close"].rolling(window=w).mean()
+        sma = np.full(n, np.nan)
+        if w <= n:
+            sma[w - 1:] = (cs[w:] - cs[:-w]) / w
+        df[f"SMA{w}"] = sma
     return df
 
 
@@ -14,7 +53,24 @@ def add_realized_vol(df: pd.DataFrame, window: int = 20, annualization: int = 25
     Rolling realized volatility from log returns (annualized).
     Used as a proxy for IV in Black-Scholes options pricing.
     """
+    if "Close" not in df.columns:
+        raise ValueError("Realized vol requires df['Close'].")
+
     df = df.copy()
-    rets = np.log(df["Close"]).diff()
-    df["RV"] = rets.rolling(window).std() * (annualization ** 0.5)
+    close = df["Close"].to_numpy(dtype=np.float64)
+
+    # bottleneck needs window <= len, and with ddof=1 a 1-bar window gives inf
+    # after a NaN where pandas gives NaN; use the pandas path for those
+    if bn is None or not (2 <= window <= len(close)):
+        rets = np.log(df["Close"]).diff()
+        df["RV"] = rets.rolling(window).std() * (annualization ** 0.5)
+        return df
+
+    log_ret = np.empty_like(close)
+    log_ret[0] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.log(close[1:] / close[:-1], out=log_ret[1:])
+
+    # ddof=1 to match pandas rolling().std()
+    df["RV"] = bn.move_std(log_ret, window=window, min_count=window, ddof=1) * (annualization ** 0.5)
     return df
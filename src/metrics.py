@@ -4,46 +4,61 @@ import pandas as pd
 
 
 def max_drawdown(equity: pd.Series) -> float:
-    peak = equity.cummax()
-    dd = equity / peak - 1.0
-    return float(dd.min())
+    eq = equity.to_numpy(dtype=np.float64)
+    if eq.size == 0:
+        return float("nan")
+    # fmax/nanmin skip NaNs the same way cummax()/min() do
+    peak = np.fmax.accumulate(eq)
+    return float(np.nanmin(eq / peak - 1.0))
 
 
 def cagr(equity: pd.Series, periods_per_year: int = 252) -> float:
-    if len(equity) < 2:
+    eq = equity.to_numpy(dtype=np.float64)
+    if eq.size < 2:
         return 0.0
-    total = equity.iloc[-1] / equity.iloc[0]
-    years = (len(equity) - 1) / periods_per_year
+    total = eq[-1] / eq[0]
+    years = (eq.size - 1) / periods_per_year
     if years <= 0:
         return 0.0
     return float(total ** (1.0 / years) - 1.0)
 
 
 def sharpe(returns: pd.Series, periods_per_year: int = 252) -> float:
-    r = returns.dropna()
-    vol = r.std(ddof=0)
+    r = returns.to_numpy(dtype=np.float64)
+    r = r[~np.isnan(r)]
+    if r.size == 0:
+        return 0.0
+    vol = r.std()  # ddof=0
     if vol == 0 or np.isnan(vol):
         return 0.0
     return float(np.sqrt(periods_per_year) * r.mean() / vol)
 
 
+def _count_nonzero(col: pd.Series) -> int:
+    return int(np.count_nonzero(col.to_numpy()))
+
+
 def summarize(bt: pd.DataFrame, benchmark_equity: pd.Series | None = None) -> dict:
     eq = bt["Equity"]
-    rets = bt["EquityReturn"]
 
     if "TradeCount" in bt.columns:
-        num_trades = int((bt["TradeCount"] != 0).sum())
+        num_trades = _count_nonzero(bt["TradeCount"])
+    elif "TradeShares" in bt.columns:
+        num_trades = _count_nonzero(bt["TradeShares"])
     else:
-        num_trades = int((bt.get("TradeShares", 0) != 0).sum())
+        num_trades = 0
 
     out = {
-        "Final Equity": float(eq.iloc[-1]),
+        "Final Equity": float(eq.to_numpy()[-1]),
         "CAGR": cagr(eq),
         "Max Drawdown": max_drawdown(eq),
-        "Sharpe": sharpe(rets),
+        "Sharpe": sharpe(bt["EquityReturn"]),
         "Num Trades": num_trades,
-        "Total Costs": float(bt["TradeCost"].sum()) if "TradeCost" in bt.columns else 0.0,
+        "Total Costs": 0.0,
     }
+    if "TradeCost" in bt.columns:
+        # nansum: NaN costs are skipped, as Series.sum() does
+        out["Total Costs"] = float(np.nansum(bt["TradeCost"].to_numpy(dtype=np.float64)))
 
     if benchmark_equity is not None:
         b = benchmark_equity.reindex(bt.index).dropna()
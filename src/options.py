@@ -1,9 +1,71 @@
 from __future__ import annotations
 import math
 
+import numpy as np
 
+from src._numba import njit
+
+_SQRT1_2 = math.sqrt(0.5)
+
+
+@njit(cache=True, inline="always")
 def _norm_cdf(x: float) -> float:
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+    # erfc form of Phi (as scipy's ndtr): no 1 + erf cancellation in the left tail
+    return 0.5 * math.erfc(-x * _SQRT1_2)
+
+
+try:
+    from scipy.special import ndtr
+except ImportError:  # optional; same CDF as _norm_cdf, element by element
+    ndtr = np.vectorize(lambda x: 0.5 * math.erfc(-x * _SQRT1_2), otypes=[np.float64])
+
+
+@njit(cache=True, inline="always")
+def _bs_price_tbl(
+    S: float, K: float, T: float, sqrt_T: float, disc: float, sigma: float, r: float, is_call: bool
+) -> float:
+    """
+    Black-Scholes core with sqrt(T) and exp(-r*T) supplied by the caller, so the
+    kernels can look them up per remaining day (see dte_tables) instead of
+    recomputing both transcendentals on every call.
+    """
+    if T <= 0:
+        if is_call:
+            return max(S - K, 0.0)
+        return max(K - S, 0.0)
+
+    sigma = max(sigma, 1e-8)
+    S = max(S, 1e-8)
+    K = max(K, 1e-8)
+
+    sig_sqrt_T = sigma * sqrt_T
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sig_sqrt_T
+    d2 = d1 - sig_sqrt_T
+
+    if is_call:
+        return S * _norm_cdf(d1) - K * disc * _norm_cdf(d2)
+    else:
+        return K * disc * _norm_cdf(-d2) - S * _norm_cdf(-d1)
+
+
+@njit(cache=True, inline="always")
+def _bs_price_nb(S: float, K: float, T: float, sigma: float, r: float, is_call: bool) -> float:
+    """
+    Compiled Black-Scholes core. Same math as bs_price, but with a bool
+    call/put flag (no string dispatch) so the backtest kernels can inline it.
+    """
+    if T <= 0:
+        return _bs_price_tbl(S, K, T, 0.0, 1.0, sigma, r, is_call)
+    return _bs_price_tbl(S, K, T, math.sqrt(T), math.exp(-r * T), sigma, r, is_call)
+
+
+def dte_tables(dte: int, r: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    sqrt(T) and exp(-r*T) for T = k/252, k = 0..dte.
+    An option opened with dte days left only ever sees these T values.
+    """
+    T = np.arange(max(int(dte), 0) + 1) / 252.0
+    return np.sqrt(T), np.exp(-r * T)
 
 
 def bs_price(S: float, K: float, T: float, sigma: float, r: float = 0.0, option_type: str = "call") -> float:
@@ -16,22 +78,47 @@ def bs_price(S: float, K: float, T: float, sigma: float, r: float = 0.0, option_
     sigma: annualized volatility
     r: risk-free rate
     """
-    if T <= 0:
-        if option_type == "call":
-            return max(S - K, 0.0)
-        return max(K - S, 0.0)
+    return _bs_price_nb(float(S), float(K), float(T), float(sigma), float(r), option_type == "call")
 
-    sigma = max(float(sigma), 1e-8)
-    S = max(float(S), 1e-8)
-    K = max(float(K), 1e-8)
 
-    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
+def bs_price_vec(S, K, T, sigma, r: float = 0.0, is_call: bool = True, sqrt_T=None, disc=None) -> np.ndarray:
+    """
+    bs_price over arrays (broadcast together): one ufunc pass per term instead
+    of a Python call per element. Same floors and T <= 0 -> intrinsic rule
+    (a NaN T prices to NaN, as in bs_price). Returns the broadcast shape,
+    0-d for all-scalar input.
+    sqrt_T / disc (exp(-r*T)) may be passed in precomputed, e.g. from dte_tables.
+    """
+    S, K, T, sigma = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (S, K, T, sigma)))
+    shape = T.shape
+    S, K, T, sigma = (np.atleast_1d(x) for x in (S, K, T, sigma))
+    if sqrt_T is None:
+        sqrt_T = np.sqrt(np.maximum(T, 0.0))
+    if disc is None:
+        disc = np.exp(-r * T)
+    sqrt_T = np.broadcast_to(np.asarray(sqrt_T, dtype=np.float64), T.shape)
+    disc = np.broadcast_to(np.asarray(disc, dtype=np.float64), T.shape)
 
-    if option_type == "call":
-        return S * _norm_cdf(d1) - K * math.exp(-r * T) * _norm_cdf(d2)
-    else:
-        return K * math.exp(-r * T) * _norm_cdf(-d2) - S * _norm_cdf(-d1)
+    out = np.array(np.maximum(S - K, 0.0) if is_call else np.maximum(K - S, 0.0), dtype=np.float64)
+
+    live = ~(T <= 0)  # NaN T goes through the formula, like bs_price
+    if live.any():
+        s = np.maximum(sigma[live], 1e-8)
+        S_ = np.maximum(S[live], 1e-8)
+        K_ = np.maximum(K[live], 1e-8)
+        t = T[live]
+        sig_sqrt_t = s * sqrt_T[live]
+
+        d1 = (np.log(S_ / K_) + (r + 0.5 * s * s) * t) / sig_sqrt_t
+        d2 = d1 - sig_sqrt_t
+        disc_K = K_ * disc[live]
+
+        if is_call:
+            out[live] = S_ * ndtr(d1) - disc_K * ndtr(d2)
+        else:
+            out[live] = disc_K * ndtr(-d2) - S_ * ndtr(-d1)
+
+    return out.reshape(shape)
 
 
 def round_strike(S: float, step: float = 1.0) -> float:
@@ -3,8 +3,14 @@ import matplotlib.pyplot as plt
 import pandas as pd
 
 
-def plot_equity(strategy_bt: pd.DataFrame, benchmark_equity: pd.Series | None = None, title: str = "Equity Curve") -> None:
-    plt.figure()
+def plot_equity(
+    strategy_bt: pd.DataFrame,
+    benchmark_equity: pd.Series | None = None,
+    title: str = "Equity Curve",
+    savepath: str | None = None,
+) -> None:
+    """Show the equity curve, or write it to savepath (and free the figure) for batch runs."""
+    fig = plt.figure()
     plt.plot(strategy_bt.index, strategy_bt["Equity"], label="Strategy")
 
     if benchmark_equity is not None:
@@ -16,4 +22,9 @@ def plot_equity(strategy_bt: pd.DataFrame, benchmark_equity: pd.Series | None =
     plt.title(title)
     plt.legend()
     plt.tight_layout()
-    plt.show()
+
+    if savepath:
+        fig.savefig(savepath)
+        plt.close(fig)
+    else:
+        plt.show()
@@ -1,7 +1,7 @@
+import numpy as np
 import pandas as pd
 
 def sma_trend_signal(df: pd.DataFrame, ma_col="SMA50") -> pd.DataFrame:
-    df = df.copy()
-    df["signal"] = 0
-    df.loc[df["Close"] > df[ma_col], "signal"] = 1
-    return df
+    # NaN MA compares False -> 0, same as before
+    sig = np.where(df["Close"].to_numpy() > df[ma_col].to_numpy(), 1, 0)
+    return df.assign(signal=sig)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 
 
@@ -17,9 +18,9 @@ def sma_crossover_signals_from_df(df: pd.DataFrame, fast: int = 20, slow: int =
     if fast_col not in df.columns or slow_col not in df.columns:
         raise ValueError(f"Missing columns: {fast_col}, {slow_col}. Run add_moving_averages first.")
 
-    desired = (df[fast_col] > df[slow_col]).astype(int).fillna(0).astype(int)
-    desired.name = "DesiredPos"
-    return desired
+    # NaN warm-up compares False -> 0
+    desired = df[fast_col].to_numpy() > df[slow_col].to_numpy()
+    return pd.Series(desired.astype(np.int8), index=df.index, name="DesiredPos")
 
 
 def sma_crossover_long_short_signals_from_df(df: pd.DataFrame, fast: int = 20, slow: int = 50) -> pd.Series:
@@ -38,9 +39,6 @@ def sma_crossover_long_short_signals_from_df(df: pd.DataFrame, fast: int = 20, s
     if fast_col not in df.columns or slow_col not in df.columns:
         raise ValueError(f"Missing columns: {fast_col}, {slow_col}. Run add_moving_averages first.")
 
-    sig = pd.Series(0, index=df.index, dtype=int)
-    sig[df[fast_col] > df[slow_col]] = 1
-    sig[df[fast_col] < df[slow_col]] = -1
-    sig = sig.fillna(0).astype(int)
-    sig.name = "DesiredPos"
-    return sig
+    diff = df[fast_col].to_numpy(dtype=np.float64) - df[slow_col].to_numpy(dtype=np.float64)
+    diff[np.isnan(diff)] = 0.0  # NaN warm-up -> flat
+    return pd.Series(np.sign(diff).astype(np.int8), index=df.index, name="DesiredPos")
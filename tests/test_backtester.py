@@ -0,0 +1,119 @@
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.backtester import (
+    BacktestConfig,
+    run_long_call_backtest,
+    run_stock_backtest,
+    run_stock_protective_put_backtest,
+)
+from src.indicators import add_moving_averages, add_realized_vol
+from src.metrics import sharpe
+from src.strategies import sma_crossover_long_short_signals_from_df, sma_crossover_signals_from_df
+
+DATA = Path(__file__).resolve().parent.parent / "data"
+
+
+def _load(name: str) -> pd.DataFrame:
+    df = pd.read_csv(DATA / name, index_col=0, parse_dates=True)
+    return df[["Open", "High", "Low", "Close", "Volume"]]
+
+
+class StockBacktestRegression(unittest.TestCase):
+    def test_blown_account_keeps_retrying_like_bar_loop(self):
+        # covering a short at 3x leverage drives cash <= 0, so the next buy can't
+        # reach the target; the original bar-by-bar loop retried on every bar after.
+        # Expected values come from that loop.
+        df = _load("PLTR_2024-01-01_2025-12-13.csv")
+        cfg = BacktestConfig(long_only=False, allow_short=True, max_leverage=3)
+
+        cases = ((20, 50, -72.84301805212311, 146), (5, 20, -941.8097880105702, 328))
+        for fast, slow, final_equity, trade_bars in cases:
+            with self.subTest(fast=fast, slow=slow):
+                d = add_moving_averages(df, windows=(fast, slow))
+                bt = run_stock_backtest(d, sma_crossover_long_short_signals_from_df(d, fast, slow), cfg)
+
+                self.assertAlmostEqual(float(bt["Equity"].iloc[-1]), final_equity, places=6)
+                self.assertEqual(int((bt["TradeShares"] != 0).sum()), trade_bars)
+
+
+class OptionsBacktestRegression(unittest.TestCase):
+    # (ticker, backtest, config, final equity, trades, total costs); expected
+    # values come from the original per-bar Python loops
+    CASES = (
+        ("QQQ", run_long_call_backtest, dict(option_dte_days=30, execution="next_open"),
+         16158.526435287014, 16, 7.199933689656259),
+        ("TSLA", run_long_call_backtest,
+         dict(option_dte_days=10, call_otm_pct=0.05, call_contracts=2, risk_free_rate=0.03, execution="next_close"),
+         35556.893280176766, 34, 31.44144534282143),
+        ("SPY", run_long_call_backtest,
+         dict(option_dte_days=60, call_otm_pct=0.02, risk_free_rate=0.05, option_strike_step=5.0),
+         10256.163875133025, 13, 7.102173260516554),
+        ("QQQ", run_stock_protective_put_backtest, dict(option_dte_days=30, execution="next_open"),
+         11474.918861146542, 8, 39.085440602872225),
+        ("TSLA", run_stock_protective_put_backtest,
+         dict(option_dte_days=10, risk_free_rate=0.03, execution="next_close"),
+         23813.446905223827, 8, 65.95550959570846),
+        ("PLTR", run_stock_protective_put_backtest,
+         dict(option_dte_days=45, risk_free_rate=0.05, max_leverage=0.5),
+         25977.09957904045, 13, 44.31597178739852),
+    )
+
+    def test_matches_original_loops(self):
+        for ticker, run, kw, final_equity, trades, costs in self.CASES:
+            with self.subTest(ticker=ticker, backtest=run.__name__, **kw):
+                df = _load(f"{ticker}_2024-01-01_2025-12-13.csv")
+                df = add_realized_vol(add_moving_averages(df, windows=(20, 50)), window=20)
+                bt = run(df, sma_crossover_signals_from_df(df, 20, 50), BacktestConfig(**kw))
+
+                self.assertAlmostEqual(float(bt["Equity"].iloc[-1]), final_equity, places=6)
+                self.assertEqual(int(bt["TradeCount"].sum()), trades)
+                self.assertAlmostEqual(float(bt["TradeCost"].sum()), costs, places=6)
+
+
+class OutOfRangeSignals(unittest.TestCase):
+    def test_values_outside_minus_one_to_one_are_flat(self):
+        # the original astype(int) loops only acted on exactly -1 / +1;
+        # nothing may wrap into that range on the way to int8
+        df = add_realized_vol(_load("SPY_2024-01-01_2025-12-13.csv"), window=20)
+        cfg = BacktestConfig(long_only=False, allow_short=True)
+        signals = {
+            "ints": [0, 2, -2, 257, -257, 255, -255],
+            "floats": [0.0, np.nan, 2.0, -2.0, 257.0, -257.0, 1e10],
+        }
+
+        for name, vals in signals.items():
+            desired = pd.Series(np.resize(np.array(vals), len(df)), index=df.index)
+            for run in (run_stock_backtest, run_long_call_backtest, run_stock_protective_put_backtest):
+                with self.subTest(signal=name, backtest=run.__name__):
+                    bt = run(df, desired, cfg)
+                    trades = bt["TradeShares"] if "TradeShares" in bt.columns else bt["TradeCount"]
+
+                    self.assertEqual(int((trades != 0).sum()), 0)
+                    self.assertTrue(np.all(bt["Equity"].to_numpy() == cfg.initial_cash))
+
+
+class Float32History(unittest.TestCase):
+    def test_float32_history_matches_float64(self):
+        # float32 keeps ~7 significant digits: equity within 1e-6 relative
+        # (about $0.01 on $10k), Sharpe within 1e-4
+        for name in ("SPY_2024-01-01_2025-12-13.csv", "TSLA_2024-01-01_2025-12-13.csv"):
+            df = add_realized_vol(add_moving_averages(_load(name), windows=(20, 50)), window=20)
+            desired = sma_crossover_signals_from_df(df, 20, 50)
+            for run in (run_stock_backtest, run_long_call_backtest, run_stock_protective_put_backtest):
+                with self.subTest(data=name, backtest=run.__name__):
+                    bt64 = run(df, desired, BacktestConfig(float32_history=False))
+                    bt32 = run(df, desired, BacktestConfig(float32_history=True))
+
+                    self.assertEqual(bt32["Equity"].dtype, np.float32)
+                    np.testing.assert_allclose(
+                        bt32["Equity"].to_numpy(dtype=np.float64), bt64["Equity"].to_numpy(), rtol=1e-6
+                    )
+                    self.assertAlmostEqual(sharpe(bt32["EquityReturn"]), sharpe(bt64["EquityReturn"]), delta=1e-4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from src.options import bs_price, bs_price_vec
+
+
+class BsPriceVec(unittest.TestCase):
+    def test_matches_scalar_bs_price_over_grid(self):
+        grid = list(
+            itertools.product(
+                (50.0, 100.0, 150.0),                       # S
+                (80.0, 100.0, 120.0),                       # K
+                (-0.1, 0.0, 1 / 252, 0.25, 1.0, np.nan),    # T
+                (0.0, 0.05, 0.3, 1.0),                      # sigma
+            )
+        )
+        S, K, T, sigma = (np.array(col) for col in zip(*grid))
+
+        for r, kind in itertools.product((0.0, 0.03), ("call", "put")):
+            with self.subTest(r=r, kind=kind):
+                vec = bs_price_vec(S, K, T, sigma, r=r, is_call=kind == "call")
+                ref = np.array([bs_price(*p, r=r, option_type=kind) for p in grid])
+                np.testing.assert_allclose(vec, ref, rtol=1e-12, atol=1e-12)
+
+    def test_scalar_input_returns_scalar_shape(self):
+        out = bs_price_vec(100.0, 100.0, 0.1, 0.2)
+        self.assertEqual(out.shape, ())
+        self.assertAlmostEqual(float(out), bs_price(100.0, 100.0, 0.1, 0.2), places=12)
+
+
+if __name__ == "__main__":
+    unittest.main()